@@ -38,15 +38,80 @@ bl_info = {
 }
 
 import bpy
-import configparser
+import functools
+import numpy as np
+import re
+import sys
 from bpy.types import Operator
 from os.path import join as joinpath, normpath, isdir
 from io import StringIO
 
-DEBUG_PRINTS = True
+DEBUG_PRINTS = False
 
 CONFIG_FILE_NAME = "QuickExportCollectionConfig"
 
+# Comment at the top of a newly created config file
+_CONFIG_HEADER_COMMENT = """\
+# Settings file for Quick Export Collection addon.
+#
+# Each [section] header below indicates configuration for one Collection.
+# The [DEFAULT] section is special; it provides defaults for any options
+# not specified in another section.
+#
+# The supported options are:
+#   exporter         - Which model format to export with. Can be changed
+#                      per-collection but usually goes in [DEFAULT].
+#                      Currently the only supported exporter is 'fbx'.
+#   directory        - The location files are exported to. Usually goes in
+#                      the [DEFAULT] section. Start the path with // to
+#                      indicate a path relative to this .blend file. Example:
+#                        directory = //../Assets/Models
+#                      If unspecified, the default is // .
+#   filename         - The output filename. If no extension is specified, the
+#                      default extension for the exporter (eg. '.fbx') is used.
+#                      If unspecified, the collection's name is used.
+#   exportable       - If set to False, the collection cannot be exported,
+#                      and it will not be included included when exporting
+#                      a parent collection. If unspecified, defaults to True.
+#   join_meshes      - If set to True, all meshes that would be exported in
+#                      this collection will be merged/joined into one during
+#                      export. It even applies when exported as a sub-collection
+#                      of another export. Modifiers will be applied before
+#                      joining, except Armature modifiers.
+#   joined_mesh_name - When join_meshes is True, this specifies the name of
+#                      the combined mesh in the export. If not specified, the
+#                      name of the collection is used.
+#   use_visible      - If True, only export visible objects. Unlike join_meshes,
+#                      this applies to the whole export, not just the collections
+#                      it's specified on. If not specified, defaults to False.
+# Additionally, any options supported by the exporter can be specified.
+# For example, the fbx exporter supports the options 'object_types',
+# 'use_triangles', 'embed_textures', and more."
+
+"""
+
+# [DEFAULT] section of a newly created config file
+_CONFIG_DEFAULT_SECTION = """\
+[DEFAULT]
+exporter = fbx
+directory = //
+
+"""
+
+# Section added for a collection the first time it's exported
+_SECTION_TEMPLATE = """\
+[{collection_name}]
+filename = {filename}
+"""
+
+# Characters that aren't allowed in export filenames are replaced with underscores
+_FILENAME_SANITIZE = str.maketrans("\\/:*?\"'<>|", "__________")
+
+# Recently parsed configs, along with the info derived from scanning all of their
+# sections, keyed by the config text. See parse_config.
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_SIZE = 8
+
 TARGET_MENUS = [
     # Context menu (aka right-click menu) for regular Collections in the outliner
     bpy.types.OUTLINER_MT_collection,
@@ -103,23 +168,254 @@ def qxc_draw_menu(self, context):
     layout.separator()
 
 
-def get_properties_for_op(op):
-    """ Get a list of all the properties (args) to a Blender operator,
-        skipping some that shouldn't be allowed to be configured in
-        the config file. """
-    prop_iter = op.get_rna_type().properties.items()
-    skip = ["rna_type", "filepath", "filter_glob", "use_active_collection", "use_selection", "batch_mode"]
-    return [(k,v) for k,v in prop_iter if k not in skip]
+# Operator properties that shouldn't be allowed to be configured in the config file
+_SKIP_PROPS = frozenset(("rna_type", "filepath", "filter_glob", "use_active_collection", "use_selection", "batch_mode"))
 
-EXPORTER_PROPERTIES = { k:get_properties_for_op(v) for k,v in EXPORTERS.items() }
+# Exporter settings used unless the config file says otherwise
+_DEFAULT_SETTINGS = {'check_existing': False}
 
+# Exporter settings that are always used, regardless of the config file.
+# Unfortunately, 'use_active_collection' will export objects in sub-collections
+# even if they are marked excluded! So using only that filter, we can't enforce
+# 'allow_export' for a collection. It could be combined with 'use_selection', but
+# also not all exporters have a 'use_active_collection' option. Most have 'use_selection'
+# though, so it's best to solely rely on selection as a means of deciding which
+# objects to export.
+_OVERRIDES = {'use_selection': True}
 
-def set_excluded_collections(
-    lc,
-    collection_names_not_exportable,
-    collection_to_export,
-    within_collection_to_export=False,
-    within_nonexportable=False):
+
+@functools.lru_cache(maxsize=64)
+def resolve_export_dir(export_dir, blend_filepath):
+    """ Turn the directory from the config file into an absolute, normalized path.
+        `blend_filepath` isn't used directly, but relative paths depend on it,
+        so it must be part of the cache key.
+    """
+    return normpath(bpy.path.native_pathsep(bpy.path.abspath(export_dir)))
+
+
+# Same boolean spellings as ConfigParser.getboolean accepts
+_BOOLEAN_STATES = {'1': True, 'yes': True, 'true': True, 'on': True,
+                   '0': False, 'no': False, 'false': False, 'off': False}
+
+def _to_bool(value):
+    """ Convert a config value to a boolean the same way ConfigParser.getboolean does """
+    if value.lower() not in _BOOLEAN_STATES:
+        raise ValueError(f"Not a boolean: {value}")
+    return _BOOLEAN_STATES[value.lower()]
+
+
+def _to_enum_flags(value):
+    # Skip empty items, e.g. from 'MESH,,ARMATURE' or a trailing comma.
+    # This must be a set, not a frozenset; Blender only accepts a set.
+    return {v for v in value.split(',') if v}
+
+# Conversions from the config string which can fail, for the kinds of property
+# that need one (see make_property_parser), and what to tell the user if they do
+_COERCERS = {'b': _to_bool, 'f': float, 'i': int}
+_COERCE_ERRORS = {'b': "should be a boolean", 'f': "should be a number", 'i': "should be an integer (whole number)"}
+
+def make_property_parser(prop_name, tag, options):
+    """ Build a function which converts and validates the config string for one
+        exporter property, raising ValueError with a message for the user if it's
+        invalid. All the decisions based on the property's type are made here, once,
+        so parsing a value on export is just a call with no branching on type.
+    """
+    if tag == 's':
+        return str
+
+    if tag == 'E':
+        # enum set
+        def parse(raw):
+            val = _to_enum_flags(raw)
+            # A blank value (or only commas) would otherwise pass as an empty set
+            if not val:
+                raise ValueError(f"Empty value for config property '{prop_name}', should be a comma-separated list out of {set(options)}")
+            if not val <= options:
+                raise ValueError(f"Invalid value(s) {val - options} for config property '{prop_name}', should be a comma-separated list out of {set(options)}")
+            return val
+    elif tag == 'e':
+        # enum single-selection
+        def parse(raw):
+            if raw not in options:
+                raise ValueError(f"Invalid value for config property '{prop_name}', should be one of {set(options)}")
+            return raw
+    else:
+        coerce = _COERCERS[tag]
+        message = f"Invalid value for config property '{prop_name}', {_COERCE_ERRORS[tag]}"
+        def parse(raw):
+            try:
+                return coerce(raw)
+            except ValueError:
+                raise ValueError(message) from None
+    return parse
+
+
+def get_exporter_dispatch(properties):
+    """ Precompute how to read each configurable property of an exporter from the
+        config file, so that doesn't have to be worked out from the RNA property on
+        every export. Returns a dict of name -> parser (see make_property_parser).
+        Properties of types other than bool, string, float, int or enum can't be set
+        from the config file.
+    """
+    dispatch = {}
+    for prop_name, prop in properties.items():
+        ty = type(prop)
+        if ty == bpy.types.BoolProperty:
+            dispatch[prop_name] = make_property_parser(prop_name, 'b', None)
+        elif ty == bpy.types.StringProperty:
+            dispatch[prop_name] = make_property_parser(prop_name, 's', None)
+        elif ty == bpy.types.FloatProperty:
+            dispatch[prop_name] = make_property_parser(prop_name, 'f', None)
+        elif ty == bpy.types.IntProperty:
+            dispatch[prop_name] = make_property_parser(prop_name, 'i', None)
+        elif ty == bpy.types.EnumProperty:
+            options = frozenset(i.identifier for i in prop.enum_items)
+            dispatch[prop_name] = make_property_parser(prop_name, 'E' if prop.is_enum_flag else 'e', options)
+    return dispatch
+
+
+# Info about each exporter, keyed by the name used in EXPORTERS. These are filled
+# in the first time an exporter is used, by load_exporter_info().
+HAS_USE_SELECTION = {}
+EXPORTER_OVERRIDES = {}
+EXPORTER_DISPATCH = {}
+
+def load_exporter_info(exporter_name):
+    """ Fill in the EXPORTER_* info for an exporter, if it hasn't been already. This
+        reads all the exporter operator's RNA properties, so it's only done for
+        exporters that actually get used, rather than for all of them at load time.
+    """
+    if exporter_name in EXPORTER_DISPATCH:
+        return
+    all_props = EXPORTERS[exporter_name].get_rna_type().properties
+
+    # The properties (args) which can be configured in the config file
+    properties = {k:v for k,v in all_props.items() if k not in _SKIP_PROPS}
+    # 'use_selection' is in _SKIP_PROPS, so check the operator's full property list
+    HAS_USE_SELECTION[exporter_name] = 'use_selection' in all_props
+    if 'use_active_collection' in all_props:
+        EXPORTER_OVERRIDES[exporter_name] = {**_OVERRIDES, 'use_active_collection': False}
+    else:
+        EXPORTER_OVERRIDES[exporter_name] = _OVERRIDES
+    # Set last, since it marks the info as loaded
+    EXPORTER_DISPATCH[exporter_name] = get_exporter_dispatch(properties)
+
+
+class FastConfigParser:
+    """ A small replacement for configparser.ConfigParser, which handles just the
+        subset of the ini format the config file needs: [section] headers, `key = value`
+        or `key: value` lines, and whole-line comments starting with # or ;. Like
+        ConfigParser, keys are case-insensitive and values are stripped of surrounding
+        whitespace, and the [DEFAULT] section provides defaults for every other section.
+        Unlike ConfigParser, there's no interpolation; values are used exactly as
+        written, so e.g. a '%' in a filename doesn't need escaping.
+
+        The [DEFAULT] section is stored in `defaults` and the rest in `sections`, all
+        as plain dicts of strings. Use section() to get one section with the defaults
+        filled in.
+    """
+    _SECTION_RE = re.compile(r'^\s*\[(.+)\]\s*$')
+    _KV_RE = re.compile(r'^\s*([^=:;#\s][^=:]*?)\s*[:=]\s*(.*?)\s*$')
+
+    def __init__(self):
+        self.defaults = {}
+        self.sections = {}
+
+    def read_string(self, text):
+        """ Parse the config text. Raises ValueError describing the first bad line,
+            including a section or an option within a section that appears twice. """
+        current = None
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            stripped = line.strip()
+            if stripped == "" or stripped[0] in "#;":
+                continue
+
+            m = self._SECTION_RE.match(line)
+            if m:
+                name = m.group(1)
+                if name == "DEFAULT":
+                    current = self.defaults
+                elif name in self.sections:
+                    raise ValueError(f"Line {line_number}: Section [{name}] appears more than once")
+                else:
+                    current = self.sections[name] = {}
+                continue
+
+            m = self._KV_RE.match(line)
+            if m is None:
+                raise ValueError(f"Line {line_number}: Expected a [section] header or 'option = value', not '{stripped}'")
+            if current is None:
+                raise ValueError(f"Line {line_number}: Option '{m.group(1)}' is not under a [section] header")
+            key = m.group(1).lower()
+            if key in current:
+                raise ValueError(f"Line {line_number}: Option '{key}' appears more than once in [{name}]")
+            current[key] = m.group(2)
+
+    def has_section(self, name):
+        return name in self.sections
+
+    def section(self, name):
+        """ Get a dict of all the values for a section, including defaults. The
+            section doesn't need to exist, in which case only defaults are returned. """
+        return {**self.defaults, **self.sections.get(name, {})}
+
+
+def _section_bool(section_name, section, key, default):
+    """ Get a boolean option from a config section, falling back to `default` (the
+        [DEFAULT] value). Raises ValueError naming the section and option if it's invalid. """
+    if key in section:
+        value = section[key]
+    else:
+        section_name, value = "DEFAULT", default
+    try:
+        return _to_bool(value)
+    except ValueError:
+        raise ValueError(f"[{section_name}] {key}: not a boolean: {value!r}") from None
+
+
+def parse_config(txt):
+    """ Parse the config file text, and find which collections are marked
+        non-exportable or request their meshes be joined. The result is cached
+        keyed by the text, so repeated exports without editing the config (or
+        after undoing an edit, or switching between blend files) don't re-parse
+        it. The returned FastConfigParser is shared with the cache, so it must
+        not be modified.
+        Raises ValueError if the config can't be parsed.
+    """
+    # Keying by the text itself rather than a hash of it means a lookup is just
+    # a hash and compare, with no chance of a collision returning the wrong config.
+    if txt in _CONFIG_CACHE:
+        return _CONFIG_CACHE[txt]
+
+    config = FastConfigParser()
+    config.read_string(txt)
+
+    # Values not in a section fall back to the [DEFAULT] section.
+    defaults = config.defaults
+    default_exportable = defaults.get('exportable', "true")
+    default_join_meshes = defaults.get('join_meshes', "false")
+    default_joined_mesh_name = defaults.get('joined_mesh_name')
+
+    collection_names_not_exportable = []
+    collection_names_requesting_join = []
+    collection_joined_mesh_names = {}
+    for collection_name, section in config.sections.items():
+        if not _section_bool(collection_name, section, 'exportable', default_exportable):
+            collection_names_not_exportable.append(collection_name)
+
+        if _section_bool(collection_name, section, 'join_meshes', default_join_meshes):
+            collection_names_requesting_join.append(collection_name)
+            collection_joined_mesh_names[collection_name] = section.get('joined_mesh_name', default_joined_mesh_name or collection_name)
+
+    result = (config, collection_names_not_exportable, collection_names_requesting_join, collection_joined_mesh_names)
+    # Evict the oldest entry once full
+    if len(_CONFIG_CACHE) >= _CONFIG_CACHE_SIZE:
+        _CONFIG_CACHE.pop(next(iter(_CONFIG_CACHE)))
+    _CONFIG_CACHE[txt] = result
+    return result
+
+
+def set_excluded_collections(root_lc, collection_names_not_exportable, collection_to_export):
     """ A LayerCollection is a wrapper around a Collection with extra info specific to the
         view layer. In particular, it holds the `exclude` property (seen as the checkbox
         next to collections in the Outliner), which determines whether objects in the
@@ -147,38 +443,57 @@ def set_excluded_collections(
           will recursively restore all child collection `exclude` to their last saved value.
           That's kinda weird, and since the root can't be excluded anyway, avoid changing it.
 
-          This function could rely on these recurisve behaviors to make it a little more
-          effecient, but they seem like implementation details that could change. So I'm
-          preferring to just always set every collection, in outer-to-inner order, to
-          pretend like the recurisve behavior doesn't exist.
+          For the most part, this function doesn't rely on these recurisve behaviors, since
+          they seem like implementation details that could change. It sets every collection,
+          in outer-to-inner order, to pretend like the recurisve behavior doesn't exist.
 
-          The only "implementation detail" I'm relying on here is that a child collection
+          The one exception is non-exportable collections within the CTE: everything below
+          them has to be exclude=True as well, so the collection is set exclude=True and its
+          children aren't visited at all. If the recursive behavior did change, the worst
+          case is that some objects in a non-exportable collection are left non-excluded.
+
+          The other "implementation detail" I'm relying on here is that a child collection
           can be exclude=False when the parent is exclude=True, which seems safe enough;
           it's been that way since Collections were introduced in 2.80
     """
 
-    if lc.collection == collection_to_export: # Needed if collection_to_export is the root/scene collection
-        within_collection_to_export = True
+    not_exportable = set(collection_names_not_exportable)
+
+    # Walk the tree iteratively, outer-to-inner. Each entry is a LayerCollection
+    # along with whether it is within the CTE.
+    # The root check is needed if collection_to_export is the root/scene collection
+    stack = [(root_lc, root_lc.collection == collection_to_export)]
+    # Debug output is buffered and written all at once at the end
+    debug_out = StringIO() if DEBUG_PRINTS else None
+    while stack:
+        lc, within_cte = stack.pop()
+
+        if DEBUG_PRINTS:
+            w_tick = "w" if within_cte else " "
+            i_tick = " " if lc.exclude else "i"
+            debug_out.write(f"  [{w_tick}{i_tick}] {lc.name}\n")
+
+        # Push in reverse so children are visited in the order shown in the Outliner
+        for clc in reversed(lc.children):
+            if clc.collection == collection_to_export:
+                clc.exclude = False
+                stack.append((clc, True))
+            elif within_cte:
+                if clc.name in not_exportable:
+                    # Everything below is non-exportable too, and setting exclude=True
+                    # recursively excludes it all, so there's no need to go further
+                    clc.exclude = True
+                    if DEBUG_PRINTS:
+                        debug_out.write(f"  [w ] {clc.name} (and all children)\n")
+                else:
+                    clc.exclude = False
+                    stack.append((clc, True))
+            else:
+                clc.exclude = True
+                stack.append((clc, False))
 
     if DEBUG_PRINTS:
-        w_tick = "w" if within_collection_to_export else " "
-        i_tick = " " if lc.exclude else "i"
-        print(f"  [{w_tick}{i_tick}] {lc.name}")
-
-    for clc in lc.children:
-        if clc.collection == collection_to_export:
-            clc.exclude = False
-            set_excluded_collections(clc, collection_names_not_exportable, collection_to_export, True, False)
-        elif within_collection_to_export:
-            tmp_wne = within_nonexportable
-            if not tmp_wne:
-                if clc.name in collection_names_not_exportable:
-                    tmp_wne = True
-            clc.exclude = tmp_wne
-            set_excluded_collections(clc, collection_names_not_exportable, collection_to_export, True, tmp_wne)
-        else:
-            clc.exclude = True
-            set_excluded_collections(clc, collection_names_not_exportable, collection_to_export, False, False)
+        sys.stdout.write(debug_out.getvalue())
 
 
 def find_topmost_collections(collection_names, collection):
@@ -195,19 +510,48 @@ def find_topmost_collections(collection_names, collection):
         listed in collection_names, and nothing outside of that. If
         "A" was appended to that collection_names list, then the output
         would be come [A].
+        `collection_names` should be a set.
     """
-    if collection.name in collection_names:
-        return [collection]
-    list = []
-    for c in collection.children:
-        list.extend(find_topmost_collections(collection_names, c))
-    return list
+    topmost = []
+    stack = [collection]
+    while stack:
+        c = stack.pop()
+        if c.name in collection_names:
+            # Don't descend; anything below is already included by this one
+            topmost.append(c)
+            continue
+        # Push in reverse so the output is in the order shown in the Outliner
+        stack.extend(reversed(c.children))
+    return topmost
+
+
+def any_hide_properties(id_collection):
+    """ Check whether any ID in `id_collection` (e.g. bpy.data.objects) has
+        hide_select or hide_viewport set, using foreach_get rather than
+        reading the properties of each ID from Python. """
+    values = np.empty(len(id_collection), dtype=bool)
+    for prop_name in ("hide_select", "hide_viewport"):
+        id_collection.foreach_get(prop_name, values)
+        if values.any():
+            return True
+    return False
 
 
 def save_global_properties(context, collection_to_export):
+    """ Record the hide_select/hide_viewport state of everything that needs them
+        temporarily cleared. Also returns the list of all objects in the collection,
+        so the caller can reuse it instead of reading `all_objects` again.
+    """
     save = []
 
-    for o in collection_to_export.all_objects:
+    all_objects = list(collection_to_export.all_objects)
+
+    # Usually nothing is hidden at all, so first do a cheap check over all of
+    # bpy.data before scanning the scene one ID at a time.
+    if not any_hide_properties(bpy.data.objects) and not any_hide_properties(bpy.data.collections):
+        return save, all_objects
+
+    for o in all_objects:
         if o.hide_select or o.hide_viewport:
             save.append((o, o.hide_select, o.hide_viewport))
 
@@ -221,53 +565,143 @@ def save_global_properties(context, collection_to_export):
         if c.hide_select or c.hide_viewport:
             save.append((c, c.hide_select, c.hide_viewport))
 
-    return save
+    return save, all_objects
+
+
+def foreach_set_hide_properties(id_collection, save, restore):
+    """ Set hide_select/hide_viewport on the IDs in `save`, all of which must be in
+        `id_collection` (e.g. bpy.data.objects), with one foreach_get/foreach_set per
+        property over the whole collection. """
+    if len(save) == 0:
+        return
+    # Local IDs are looked up by name. Linked IDs can share a name with a local one
+    # or with each other, so for those fall back to an index of the whole collection,
+    # built only if there are any.
+    linked_index = None
+    indices = []
+    for oc,_,_ in save:
+        if oc.library is None:
+            indices.append(id_collection.find(oc.name))
+        else:
+            if linked_index is None:
+                linked_index = {other:i for i,other in enumerate(id_collection)}
+            indices.append(linked_index[oc])
+    values = np.empty(len(id_collection), dtype=bool)
+    for prop_name, saved_index in (("hide_select", 1), ("hide_viewport", 2)):
+        id_collection.foreach_get(prop_name, values)
+        values[indices] = [e[saved_index] for e in save] if restore else False
+        id_collection.foreach_set(prop_name, values)
+
+
+def set_global_properties(save, restore):
+    """ Either clear (restore=False) or restore (restore=True) the properties
+        recorded by save_global_properties.
+
+        Assigning these properties one at a time is slow because every assignment
+        runs an update which resyncs all the view layers. foreach_set doesn't run
+        updates, so write everything with that, then make one ordinary assignment
+        per ID type so the update happens once for the whole batch.
+    """
+    objects = [e for e in save if isinstance(e[0], bpy.types.Object)]
+    collections = [e for e in save if not isinstance(e[0], bpy.types.Object)]
+    foreach_set_hide_properties(bpy.data.objects, objects, restore)
+    foreach_set_hide_properties(bpy.data.collections, collections, restore)
+    for group in (objects, collections):
+        if len(group) > 0:
+            oc = group[0][0]
+            oc.hide_viewport = oc.hide_viewport
 
 
 def restore_global_properties(save):
-    for oc, hide_select, hide_viewport in save:
-        oc.hide_select = hide_select
-        oc.hide_viewport = hide_viewport
+    set_global_properties(save, restore=True)
 
 
-def select_objects(objects, mesh_only=False, replace=True):
-    if replace:
-        bpy.ops.object.select_all(action = 'DESELECT')
-    for o in objects:
-        if not mesh_only or o.type == 'MESH':
-            o.select_set(True)
+def change_selection(selected_objects, objects_to_select):
+    """ Make `objects_to_select` the only selected objects. `selected_objects` must
+        be the set of currently selected objects. Rather than using the (slow)
+        deselect all operator, only the objects whose selection actually changes
+        are touched. The set is updated in place.
+    """
+    objects_to_select = set(objects_to_select)
+
+    for o in selected_objects - objects_to_select:
+        o.select_set(False)
+    for o in objects_to_select - selected_objects:
+        o.select_set(True)
+
+    selected_objects.clear()
+    selected_objects.update(objects_to_select)
 
 
-def select_included_objects_in_collection(view_layer, collection, hidden_objects, mesh_only=False):
-    """ Select set intersection between all the objects contained in
+def get_included_objects_in_collection(view_layer_objects, collection, hidden_objects, mesh_only=False):
+    """ Get set intersection between all the objects contained in
         the collection, and all the objects not excluded in the view layer.
-        Also, remove any objects recorded as invisible at the beginning of export
+        Also, remove any objects recorded as invisible at the beginning of export.
+        `view_layer_objects` is a prebuilt set of the view layer's objects, so
+        it only has to be gathered once per export.
     """
 
-    bpy.ops.object.select_all(action = 'DESELECT')
+    objects = (set(collection.all_objects) & view_layer_objects) - hidden_objects
+    if mesh_only:
+        objects = {o for o in objects if o.type == 'MESH'}
+    return objects
 
-    objects_to_export = set(collection.all_objects) & set(view_layer.objects)
-    objects_to_export -= hidden_objects
 
-    select_objects(objects_to_export, mesh_only=mesh_only)
+def debug_print_objects(header, objects, view_layer_objects, hidden_objects, joined_meshes=None):
+    """ Debug listing of objects, marking whether each is in the view layer (v),
+        was hidden at the start of export (h), and, if `joined_meshes` is given,
+        whether it is a joined mesh (j). All the lookups should be sets.
+    """
+    print(header)
+    for o in objects:
+        v_tick = "v" if o in view_layer_objects else " "
+        h_tick = "h" if o in hidden_objects else " "
+        j_tick = "" if joined_meshes is None else ("j" if o in joined_meshes else " ")
+        print(f"  [{v_tick}{h_tick}{j_tick}] {o.name}")
 
 
-def apply_modifiers_on_objects(objects, context=bpy.context):
-    prev_selected = context.selected_objects.copy()
-    prev_active = context.view_layer.objects.active
-    bpy.ops.object.select_all(action = 'DESELECT')
-    for o in objects:
-        o.select_set(True)
-        context.view_layer.objects.active = o
-        # Note this will iterate over armatures in the top-to-bottom order shown in the UI
-        for mod in o.modifiers:
-            print(mod.name)
-            if mod.type != 'ARMATURE':
-                bpy.ops.object.modifier_set_active(modifier=mod.name)
-                bpy.ops.object.modifier_apply(modifier=mod.name)
-        o.select_set(False)
-    select_objects(prev_selected)
-    context.view_layer.objects.active = prev_active
+def duplicate_with_modifiers_applied(objects, context):
+    """ Equivalent of bpy.ops.object.duplicate followed by applying every modifier
+        except Armature modifiers, done through the data API rather than operators
+        (each of which does a depsgraph evaluation and undo push). The copies are
+        linked into the same collections as the originals. Returns the copies.
+    """
+    copies = [o.copy() for o in objects]
+    for o, copy in zip(objects, copies):
+        for c in o.users_collection:
+            c.objects.link(copy)
+
+    # Only copies with an enabled modifier to apply need evaluating. The rest just
+    # get a copy of the mesh like duplicate(linked=False) would, since an evaluated
+    # mesh loses its shape keys, which the join would otherwise keep.
+    to_evaluate = []
+    for o, copy in zip(objects, copies):
+        if any(m.type != 'ARMATURE' and m.show_viewport for m in o.modifiers):
+            to_evaluate.append(copy)
+        else:
+            copy.data = o.data.copy()
+
+    if len(to_evaluate) > 0:
+        # Armature modifiers are left on the copies rather than applied, so disable
+        # them while evaluating. This is done on the copies rather than the originals,
+        # which may be linked from a library and so not editable.
+        disabled_modifiers = []
+        for copy in to_evaluate:
+            for mod in copy.modifiers:
+                if mod.type == 'ARMATURE' and mod.show_viewport:
+                    mod.show_viewport = False
+                    disabled_modifiers.append(mod)
+        depsgraph = context.evaluated_depsgraph_get()
+        for copy in to_evaluate:
+            copy.data = bpy.data.meshes.new_from_object(copy.evaluated_get(depsgraph), preserve_all_data_layers=True, depsgraph=depsgraph)
+        for mod in disabled_modifiers:
+            mod.show_viewport = True
+
+    for copy in copies:
+        for mod in [m for m in copy.modifiers if m.type != 'ARMATURE']:
+            copy.modifiers.remove(mod)
+
+    return copies
 
 
 class QXC_OT_export(Operator):
@@ -294,13 +728,13 @@ class QXC_OT_export(Operator):
         print(f"=== Exporting collection '{collection_to_export.name}' ===")
 
         s = self.get_export_settings(context, collection_to_export.name)
-        if s == None:
+        if s is None:
             return {'CANCELLED'}
         exporter_name, settings, collection_names_not_exportable, collection_names_requesting_join, collection_joined_mesh_names = s
 
         export_func = EXPORTERS[exporter_name]
 
-        if 'use_selection' in EXPORTER_PROPERTIES[exporter_name]:
+        if not HAS_USE_SELECTION[exporter_name]:
             self.report({'ERROR'},
 f"Exporter '{exporter_name}' does not have a property 'use_selection' which \
 is required for Quick Export Collection to work. If this exporter has a different \
@@ -308,36 +742,23 @@ name for a property of the same concept, or doesn't have that property at all, \
 you'll need to edit the code to account for it.")
             return {'CANCELLED'}
 
-        # Ignore these values if set
-        settings.pop('use_active_collection', None)
-        settings.pop('use_selection', None)
-
         print("Using settings:")
         for k,v in settings.items():
-            if k not in ['use_active_collection', 'use_selection']:
-                vprint = repr(v).replace("\\\\", "\\")
-                print(f"  {k}={vprint}")
-
-        if 'check_existing' not in settings:
-            settings['check_existing'] = False
-
-        # Unfortunately, 'use_active_collection' will export objects in sub-collections
-        # even if they are marked excluded! So using only that filter, we can't enforce
-        # 'allow_export' for a collection. It could be combined with 'use_selection', but
-        # also not all exporters have a 'use_active_collection' option. Most have 'use_selection'
-        # though, so it's best to solely rely on selection as a means of deciding which
-        # objects to export.
-        if 'use_active_collection' in EXPORTER_PROPERTIES[exporter_name]:
-            settings['use_active_collection'] = False
-        settings['use_selection'] = True
-
-        # A snag in that plan is the 'hide_select' and 'hide_viewport' options of objects and
-        # collections which prevent them being selected. We need to temporarily disable those
-        # properties on not only every object we want to export, so we can select it, but also
-        # on every collection containing those objects, since they apply recursively.
-        # To make sure we can restore in case of Exceptions, only record the properties now
-        # and modify them later in the try/except block.
-        saved_object_properties = save_global_properties(context, collection_to_export)
+            vprint = repr(v).replace("\\\\", "\\")
+            print(f"  {k}={vprint}")
+
+        # Config file settings can't contain 'use_selection' or 'use_active_collection'
+        # (see _SKIP_PROPS), so the overrides only add to them.
+        settings = {**_DEFAULT_SETTINGS, **settings, **EXPORTER_OVERRIDES[exporter_name]}
+
+        # A snag in relying on selection (see _OVERRIDES) is the 'hide_select' and
+        # 'hide_viewport' options of objects and collections which prevent them being
+        # selected. We need to temporarily disable those properties on not only every
+        # object we want to export, so we can select it, but also on every collection
+        # containing those objects, since they apply recursively. To make sure we can
+        # restore in case of Exceptions, only record the properties now and modify them
+        # later in the try/except block.
+        saved_object_properties, all_objects_to_export = save_global_properties(context, collection_to_export)
 
         # 'use_visible' is difficult because other actions will modify the visiblity
         # state, for example setting `exclude=False` to collections resets the contained
@@ -345,15 +766,13 @@ you'll need to edit the code to account for it.")
         hidden_objects = set()
         if 'use_visible' in settings and settings['use_visible']:
             del settings['use_visible']
-            for o in collection_to_export.all_objects:
-                if not o.visible_get():
-                    hidden_objects.add(o)
+            hidden_objects = {o for o in all_objects_to_export if not o.visible_get()}
 
         # Optimize the mesh joining process by only joining at the topmost collection nesting
         # level necessary. I.e. meshes only need to get joined once, not multiple times from
         # inner to outer.
         if len(collection_names_requesting_join) > 0:
-            collections_to_join = find_topmost_collections(collection_names_requesting_join, collection_to_export)
+            collections_to_join = find_topmost_collections(set(collection_names_requesting_join), collection_to_export)
         else:
             collections_to_join = []
 
@@ -362,6 +781,22 @@ you'll need to edit the code to account for it.")
             for c in collections_to_join:
                 print(f"  {c.name} --> {collection_joined_mesh_names[c.name]}")
 
+        # If there's nothing that could possibly be exported, skip all the view layer
+        # setup below; just deselect everything and export. (Objects can only get
+        # removed from the export from here on, and any meshes to join would be
+        # among these objects too.)
+        if len(set(all_objects_to_export) - hidden_objects) == 0:
+            saved_selection = context.selected_objects
+            try:
+                for o in saved_selection:
+                    o.select_set(False)
+                result = export_func(**settings)
+                self.report_export_result(result, collection_to_export, settings, is_empty=True)
+            finally:
+                for o in saved_selection:
+                    o.select_set(True)
+            return result
+
         result = {'CANCELLED'}
 
         # Create a new view layer so we can modify excluded collections and selected
@@ -386,24 +821,23 @@ you'll need to edit the code to account for it.")
 
             set_excluded_collections(new_view_layer.layer_collection, collection_names_not_exportable, collection_to_export)
 
+            # Which objects are in the view layer only changes when collections are
+            # (un)excluded, so gather them once now rather than for every selection.
+            # Note this won't include joined meshes created below.
+            view_layer_objects = set(new_view_layer.objects)
+
             # Enter block which restores the previous hide_select/hide_viewport state on exit
             try:
-                for oc,_,_ in saved_object_properties:
-                    oc.hide_select = False
-                    oc.hide_viewport = False
+                set_global_properties(saved_object_properties, restore=False)
+
+                # Tracks the selection in the new view layer, see change_selection
+                selected_objects = set(context.selected_objects)
 
                 if DEBUG_PRINTS:
-                    print(f"[DEBUG] Objects in '{collection_to_export.name}':")
                     # Note that hidden ("Hide in Viewport") objects are still in the viewlayer
                     # Excluding a collection is what removes objects from the viewlayer
-                    viewlayer_object_names = new_view_layer.objects.keys()
-                    collection_object_names = collection_to_export.all_objects.keys()
-                    for on in collection_object_names:
-                        in_viewlayer = on in viewlayer_object_names
-                        is_hidden = bpy.data.objects[on] in hidden_objects
-                        v_tick = "v" if in_viewlayer else " "
-                        h_tick = "h" if is_hidden else " "
-                        print(f"  [{v_tick}{h_tick}] {on}")
+                    debug_print_objects(f"[DEBUG] Objects in '{collection_to_export.name}':",
+                        all_objects_to_export, view_layer_objects, hidden_objects)
 
                 joined_meshes = []
                 duplicated_meshes = []
@@ -411,15 +845,21 @@ you'll need to edit the code to account for it.")
                 renamed_objects = []
                 # Enter block which removes duplicated or joined meshes on exit
                 try:
-                    # Create joined versions of meshes in collections that were requested to be joined
-                    for c in collections_to_join:
-                        select_included_objects_in_collection(new_view_layer, c, hidden_objects, mesh_only=True)
-                        if len(context.selected_objects) > 0:
-                            if bpy.ops.object.duplicate(linked=False) != {'FINISHED'}:
-                                raise RuntimeError(f"Failed to duplicate meshes (as part of making a joined mesh) in collection {c.name}. Selected objects are: {repr(context.selected_objects)}")
-                            duplicated_meshes = context.selected_objects.copy()
+                    # Duplicate the meshes of all the collections that were requested to be
+                    # joined up front, so the depsgraph only gets evaluated once for all of them
+                    meshes_to_join = [list(get_included_objects_in_collection(view_layer_objects, c, hidden_objects, mesh_only=True))
+                                      for c in collections_to_join]
+                    all_meshes_to_join = [o for meshes in meshes_to_join for o in meshes]
+                    if len(all_meshes_to_join) > 0:
+                        duplicated_meshes = duplicate_with_modifiers_applied(all_meshes_to_join, context)
 
-                            apply_modifiers_on_objects(duplicated_meshes, context)
+                    # Create joined versions of meshes in collections that were requested to be joined
+                    next_duplicate = 0
+                    for c, meshes in zip(collections_to_join, meshes_to_join):
+                        duplicates = duplicated_meshes[next_duplicate:next_duplicate+len(meshes)]
+                        next_duplicate += len(meshes)
+                        if len(duplicates) > 0:
+                            change_selection(selected_objects, duplicates)
 
                             # Make sure the active object is among the selected
                             # objects otherwise join() is unhappy.
@@ -436,7 +876,7 @@ you'll need to edit the code to account for it.")
                                     break
                                 elif obj.name == c.name:
                                     active_object_candidate = obj
-                            if active_object_candidate != None:
+                            if active_object_candidate is not None:
                                 context.view_layer.objects.active = active_object_candidate
                             else:
                                 context.view_layer.objects.active = context.selected_objects[0]
@@ -464,27 +904,21 @@ you'll need to edit the code to account for it.")
                                 raise RuntimeError(f"Duplicate in joined meshes list! When joining meshes in collection {c.name}. Duplicate object is: {repr(context.selected_objects)}")
 
                             joined_meshes.append(new_joined_mesh)
-                            duplicated_meshes = []
+                            # Joining changed the selection
+                            selected_objects = {new_joined_mesh}
+
+                    duplicated_meshes = []
 
                     if DEBUG_PRINTS and len(collections_to_join) > 0:
-                        print(f"[DEBUG] Objects in '{collection_to_export.name}' after joining meshes:")
-                        viewlayer_object_names = new_view_layer.objects.keys()
-                        collection_object_names = collection_to_export.all_objects.keys()
-                        joined_mesh_names = [o.name for o in joined_meshes]
-                        for on in collection_object_names:
-                            in_viewlayer = on in viewlayer_object_names
-                            is_hidden = bpy.data.objects[on] in hidden_objects
-                            is_joined_mesh = on in joined_mesh_names
-                            v_tick = "v" if in_viewlayer else " "
-                            h_tick = "h" if is_hidden else " "
-                            j_tick = "j" if is_joined_mesh else " "
-                            print(f"  [{v_tick}{h_tick}{j_tick}] {on}")
+                        # Re-read the objects, since the joined meshes have been added
+                        debug_print_objects(f"[DEBUG] Objects in '{collection_to_export.name}' after joining meshes:",
+                            collection_to_export.all_objects, frozenset(new_view_layer.objects), hidden_objects, frozenset(joined_meshes))
 
                     # Select all objects to export.
-                    # If joined meshes are involved, this first selection will include both
-                    # the original separate meshes *and* the joined meshes! That will be
+                    # If joined meshes are involved, this first selection will include the
+                    # original separate meshes but not the joined meshes! That will be
                     # resolved in the next step
-                    select_included_objects_in_collection(new_view_layer, collection_to_export, hidden_objects)
+                    change_selection(selected_objects, get_included_objects_in_collection(view_layer_objects, collection_to_export, hidden_objects))
 
                     if DEBUG_PRINTS and len(collections_to_join) > 0:
                         print("[DEBUG] Objects selected for export (before filtering joined meshes):")
@@ -492,10 +926,10 @@ you'll need to edit the code to account for it.")
                             print(f"  {o.name}")
 
                     # Unselect everything from joined collections...
-                    for c in collections_to_join:
-                        for o in c.all_objects:
-                            if o.type == 'MESH':
-                                o.select_set(False)
+                    joined_mesh_originals = {o for c in collections_to_join for o in c.all_objects if o.type == 'MESH'}
+                    for o in context.selected_objects:
+                        if o in joined_mesh_originals:
+                            o.select_set(False)
 
                     if DEBUG_PRINTS and len(collections_to_join) > 0:
                         print("[DEBUG] Objects selected for export (filter step 1):")
@@ -515,13 +949,7 @@ you'll need to edit the code to account for it.")
 
                     # At last! Do the actual export! Woooo
                     result = export_func(**settings)
-
-                    if result == {'FINISHED'}:
-                        msg = f"Successfully exported {collection_to_export.name} to {settings['filepath']}"
-                        if is_empty:
-                            self.report({'WARNING'}, "[Export is empty!] " + msg)
-                        else:
-                            self.report({'INFO'}, msg)
+                    self.report_export_result(result, collection_to_export, settings, is_empty)
 
                 finally:
                     # Remove any objects created by the mesh joining process
@@ -550,15 +978,24 @@ you'll need to edit the code to account for it.")
         return result
 
 
+    def report_export_result(self, result, collection_to_export, settings, is_empty):
+        if result == {'FINISHED'}:
+            msg = f"Successfully exported {collection_to_export.name} to {settings['filepath']}"
+            if is_empty:
+                self.report({'WARNING'}, "[Export is empty!] " + msg)
+            else:
+                self.report({'INFO'}, msg)
+
+
     def get_export_settings(self, context, collection_name):
         """ Get all the info from the config file necessary to export a particular collection.
             Will create the config file or config section if not available.
             Also returns some general info about all collections from the config file which is
             necessary for exporting the desired collection.
         """
-        global EXPORTERS, EXPORTER_PROPERTIES, CONFIG_FILE_NAME
+        global EXPORTERS, CONFIG_FILE_NAME
 
-        config = configparser.ConfigParser()
+        config = None
         create_conf_file = False
         append_section = False
 
@@ -567,28 +1004,38 @@ you'll need to edit the code to account for it.")
             if txt == "" or txt.isspace():
                 create_conf_file = True
             else:
-                config.read_string(txt)
+                try:
+                    config, collection_names_not_exportable, collection_names_requesting_join, collection_joined_mesh_names = parse_config(txt)
+                except ValueError as e:
+                    self.report({'ERROR'}, f"Error in config file {CONFIG_FILE_NAME}: {e}")
+                    return None
         else:
             create_conf_file = True
 
+        if config is None:
+            config = FastConfigParser()
+
         if not config.has_section(collection_name):
-            config.add_section(collection_name)
             append_section = True
 
-        create = (create_conf_file or append_section)
+        # Note that col_config includes the values from the [DEFAULT] section
+        # for anything not set directly in the collection's section.
+        col_config = config.section(collection_name)
 
-        default = config.defaults()
-        # Note that accessing something in col_config will return the value
-        # from defaults() if its not set directly in the col_config section.
-        col_config = config[collection_name]
+        try:
+            exportable = _section_bool(collection_name, config.sections.get(collection_name, {}),
+                                       'exportable', config.defaults.get('exportable', "true"))
+        except ValueError as e:
+            self.report({'ERROR'}, f"Error in config file {CONFIG_FILE_NAME}: {e}")
+            return None
 
-        if not col_config.getboolean('exportable', fallback=True):
+        if not exportable:
             self.report({'ERROR'},
 f"'{collection_name}' is marked unexportable in config. (The config \
 file {CONFIG_FILE_NAME} can be found in the Text Editor window.)")
             return None
 
-        exporter_name = col_config.get('exporter', fallback="fbx")
+        exporter_name = col_config.get('exporter', "fbx")
 
         if exporter_name not in EXPORTERS:
             self.report({'ERROR'},
@@ -597,9 +1044,11 @@ Please adjust it in the config file {CONFIG_FILE_NAME}, which is found in the \
 Text Editor window.")
             return None
 
-        export_filename = col_config.get('filename', fallback=f"{collection_name}.{exporter_name}")
+        load_exporter_info(exporter_name)
+
+        export_filename = col_config.get('filename', f"{collection_name}.{exporter_name}")
 
-        export_dir = col_config.get('directory', fallback="//")
+        export_dir = col_config.get('directory', "//")
 
         if export_dir[:2] == "./" or export_dir[:2] == ".\\":
             self.report({'WARNING'},
@@ -634,29 +1083,18 @@ f"Export directory '{export_dir}' is relative to blend file, but the blend \
 file is not saved. Please save first.")
             return None
 
-        export_dir = normpath(bpy.path.native_pathsep(bpy.path.abspath(export_dir)))
+        export_dir = resolve_export_dir(export_dir, bpy.data.filepath)
+        # Not cached, since the user may create the directory after seeing this error
         if not isdir(export_dir):
             self.report({'ERROR'}, f"Export directory '{export_dir}' does not exist.")
             return None
 
         args = self.get_exporter_args_from_config(exporter_name, col_config)
-        if args == None:
+        if args is None:
             return None
 
-        collection_names_not_exportable = []
-        collection_names_requesting_join = []
-        collection_joined_mesh_names = {}
-        for collection_name in config.sections():
-            if not config.getboolean(collection_name, 'exportable', fallback=True):
-                collection_names_not_exportable.append(collection_name)
-
-            if config.getboolean(collection_name, 'join_meshes', fallback=False):
-                collection_names_requesting_join.append(collection_name)
-                collection_joined_mesh_names[collection_name] = config.get(collection_name, 'joined_mesh_name', fallback=collection_name)
-
         export_filename = bpy.path.ensure_ext(export_filename, f".{exporter_name}")
-        t = str.maketrans("\\/:*?\"'<>|", "__________")
-        export_filename = export_filename.translate(t)
+        export_filename = export_filename.translate(_FILENAME_SANITIZE)
 
         args['filepath'] = joinpath(export_dir, export_filename)
 
@@ -664,115 +1102,49 @@ file is not saved. Please save first.")
 
 
     def make_new_config_file(self, collection_name, filename):
-        text = f"""\
-# Settings file for Quick Export Collection addon.
-#
-# Each [section] header below indicates configuration for one Collection.
-# The [DEFAULT] section is special; it provides defaults for any options
-# not specified in another section.
-#
-# The supported options are:
-#   exporter         - Which model format to export with. Can be changed
-#                      per-collection but usually goes in [DEFAULT].
-#                      Currently the only supported exporter is 'fbx'.
-#   directory        - The location files are exported to. Usually goes in
-#                      the [DEFAULT] section. Start the path with // to
-#                      indicate a path relative to this .blend file. Example:
-#                        directory = //../Assets/Models
-#                      If unspecified, the default is // .
-#   filename         - The output filename. If no extension is specified, the
-#                      default extension for the exporter (eg. '.fbx') is used.
-#                      If unspecified, the collection's name is used.
-#   exportable       - If set to False, the collection cannot be exported,
-#                      and it will not be included included when exporting
-#                      a parent collection. If unspecified, defaults to True.
-#   join_meshes      - If set to True, all meshes that would be exported in
-#                      this collection will be merged/joined into one during
-#                      export. It even applies when exported as a sub-collection
-#                      of another export. Modifiers will be applied before
-#                      joining, except Armature modifiers.
-#   joined_mesh_name - When join_meshes is True, this specifies the name of
-#                      the combined mesh in the export. If not specified, the
-#                      name of the collection is used.
-#   use_visible      - If True, only export visible objects. Unlike join_meshes,
-#                      this applies to the whole export, not just the collections
-#                      it's specified on. If not specified, defaults to False.
-# Additionally, any options supported by the exporter can be specified.
-# For example, the fbx exporter supports the options 'object_types',
-# 'use_triangles', 'embed_textures', and more."
-
-[DEFAULT]
-exporter = fbx
-directory = //
-
-[{collection_name}]
-filename = {filename}
-"""
-        if CONFIG_FILE_NAME not in bpy.data.texts:
-            bpy.data.texts.new(CONFIG_FILE_NAME)
-        bpy.data.texts[CONFIG_FILE_NAME].from_string(text)
+        t = bpy.data.texts.get(CONFIG_FILE_NAME)
+        if t is None:
+            t = bpy.data.texts.new(CONFIG_FILE_NAME)
+        section = _SECTION_TEMPLATE.format_map({'collection_name': collection_name, 'filename': filename})
+        t.from_string(_CONFIG_HEADER_COMMENT + _CONFIG_DEFAULT_SECTION + section)
 
 
     def append_new_section_to_config_file(self, collection_name, filename):
-        text = bpy.data.texts[CONFIG_FILE_NAME].as_string()
-        if text[-1:] != "\n":
-            text += "\n"
-        text += f"""\n\
-[{collection_name}]
-filename = {filename}
-"""
-        bpy.data.texts[CONFIG_FILE_NAME].from_string(text)
+        t = bpy.data.texts[CONFIG_FILE_NAME]
+        text = t.as_string()
+        # Text.write() inserts at the cursor, not the end, so the whole text has
+        # to be replaced. Build it with a single join rather than repeated +=.
+        separator = "\n" if text.endswith("\n") else "\n\n"
+        section = _SECTION_TEMPLATE.format_map({'collection_name': collection_name, 'filename': filename})
+        t.from_string("".join((text, separator, section)))
 
 
     def get_exporter_args_from_config(self, exporter, config_section):
-        """ For the current exporter (e.g. fbx) look at all the properties/settings/options
-            it accepts, and see if there is an entry in the config file for it. If so, validate
-            it to make sure its the correct type or in the allowed set of enum options.
+        """ For the current exporter (e.g. fbx) look at all the entries in the config file
+            section, and see if the exporter accepts a property/setting/option of that name.
+            If so, validate it to make sure its the correct type or in the allowed set of
+            enum options. Entries that aren't exporter properties are ignored.
             Returns a dictionary that is ready to be passed to the exporter operator function
-            via **args.
+            via **args. If any values are invalid, they are all reported in one error
+            (so they can all be fixed at once) and None is returned.
         """
         args = {}
-        for prop_name, prop in EXPORTER_PROPERTIES[exporter]:
-            ty = type(prop)
-            if ty == bpy.types.BoolProperty:
-                try:
-                    val = config_section.getboolean(prop_name)
-                except ValueError:
-                    self.report({'ERROR'}, f"Invalid value for config property '{prop_name}', should be a boolean")
-                    return None
-            elif ty == bpy.types.StringProperty:
-                val = config_section.get(prop_name)
-            elif ty == bpy.types.FloatProperty:
-                try:
-                    val = config_section.getfloat(prop_name)
-                except ValueError:
-                    self.report({'ERROR'}, f"Invalid value for config property '{prop_name}', should be a number")
-                    return None
-            elif ty == bpy.types.IntProperty:
-                try:
-                    val = config_section.getint(prop_name)
-                except ValueError:
-                    self.report({'ERROR'}, f"Invalid value for config property '{prop_name}', should be an integer (whole number)")
-                    return None
-            elif ty == bpy.types.EnumProperty:
-                val = config_section.get(prop_name)
-                if val != None:
-                    options = set([i.identifier for i in prop.enum_items])
-                    if prop.is_enum_flag:
-                        # enum set
-                        val = set(val.split(','))
-                        for v in val:
-                            if v not in options:
-                                self.report({'ERROR'}, f"Invalid value for config property '{prop_name}', should be a comma-separated list out of {options}")
-                                return None
-                    else:
-                        # enum single-selection
-                        if val not in options:
-                            self.report({'ERROR'}, f"Invalid value for config property '{prop_name}', should be one of {options}")
-                            return None
-
-            if val != None:
-                args[prop_name] = val
+        errors = []
+        # There are usually far fewer entries in the config than exporter properties,
+        # so look up each entry rather than looking for each property in the config
+        dispatch = EXPORTER_DISPATCH[exporter]
+        for prop_name, raw in config_section.items():
+            parse = dispatch.get(prop_name)
+            if parse is None:
+                continue
+            try:
+                args[prop_name] = parse(raw)
+            except ValueError as e:
+                errors.append(str(e))
+
+        if len(errors) > 0:
+            self.report({'ERROR'}, "\n".join(errors))
+            return None
         return args
 
 